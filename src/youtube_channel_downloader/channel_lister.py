@@ -1,14 +1,40 @@
 """Channel video listing functionality using yt-dlp."""
 
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import yt_dlp
+from typing import List, Dict, Any, Iterator, Optional
 from rich.console import Console
-from rich.table import Table
 
 
 console = Console()
 
+# How long a cached channel listing stays fresh, in seconds
+CACHE_TTL = 3600
+
+# Channel tabs that hold uploads; a bare channel URL is listed tab by tab
+CHANNEL_TABS = ("videos", "shorts", "streams")
+
+_CHANNEL_URL_RE = re.compile(
+    r"^(?P<base>(?:https?://)?(?:www\.|m\.)?youtube\.com/"
+    r"(?:@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+))/?$"
+)
+_MISSING_TAB_RE = re.compile(r"does not have an? \w+ tab")
+# yt-dlp errors that mean the content needs a logged-in session
+_AUTH_RE = re.compile(r"sign[ -]?in|login|authenticat", re.IGNORECASE)
+
+# A YoutubeDL loads its cookie file on first use and rewrites it on close, so
+# concurrent listings must not read or write the file while another rewrites it
+_COOKIE_FILE_LOCK = threading.Lock()
+
 
 class ChannelListingError(Exception):
     """Raised when channel listing fails."""
@@ -16,8 +42,85 @@ class ChannelListingError(Exception):
     pass
 
 
+class _TabLogger:
+    """yt-dlp logger that hides errors for tabs a channel doesn't have."""
+
+    def __init__(self, verbose: bool):
+        self.verbose = verbose
+
+    def debug(self, msg: str) -> None:
+        if self.verbose:
+            print(msg, file=sys.stderr)
+
+    def warning(self, msg: str) -> None:
+        if self.verbose:
+            print(f"WARNING: {msg}", file=sys.stderr)
+
+    def error(self, msg: str) -> None:
+        if not _MISSING_TAB_RE.search(msg):
+            print(msg, file=sys.stderr)
+
+
+def _channel_tab_urls(channel_url: str) -> List[str]:
+    """Split a bare channel URL into one URL per uploads tab."""
+    match = _CHANNEL_URL_RE.match(channel_url)
+    if not match:
+        return [channel_url]
+    return [f"{match['base']}/{tab}" for tab in CHANNEL_TABS]
+
+
+@contextmanager
+def _open_ydl(ydl_opts: Dict[str, Any]) -> Iterator[Any]:
+    """Open a YoutubeDL whose cookie file is loaded and saved under _COOKIE_FILE_LOCK."""
+    import yt_dlp
+
+    with _COOKIE_FILE_LOCK:
+        ydl = yt_dlp.YoutubeDL(ydl_opts).__enter__()
+        if "cookiefile" in ydl_opts:
+            # Load the cookies now rather than on the first request
+            ydl.cookiejar
+    try:
+        yield ydl
+    finally:
+        with _COOKIE_FILE_LOCK:
+            ydl.__exit__(None, None, None)
+
+
+def _cache_path(channel_url: str, cookie_file: Optional[Path]) -> Path:
+    """Return the cache file for a channel listing."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    # Authenticated listings can include members-only videos, so cache them separately
+    key = hashlib.sha1(f"{channel_url}|{bool(cookie_file)}".encode()).hexdigest()
+    return Path(cache_home) / "youtube-channel-downloader" / f"{key}.json"
+
+
+def _read_cache(cache_path: Path, ttl: float) -> Optional[List[Dict[str, Any]]]:
+    """Return a cached listing if it exists and is fresh, otherwise None."""
+    try:
+        if time.time() - cache_path.stat().st_mtime >= ttl:
+            return None
+        return json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(cache_path: Path, videos: List[Dict[str, Any]]) -> None:
+    """Store a listing in the cache; failures only cost the next run a refetch."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(videos, default=str), encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+
 def list_channel_videos(
-    channel_url: str, cookie_file: Optional[Path] = None, verbose: bool = False
+    channel_url: str,
+    cookie_file: Optional[Path] = None,
+    verbose: bool = False,
+    use_cache: bool = False,
+    cache_ttl: float = CACHE_TTL,
 ) -> List[Dict[str, Any]]:
     """
     List all videos from a YouTube channel without downloading them.
@@ -26,6 +129,8 @@ def list_channel_videos(
         channel_url: URL of the YouTube channel or playlist
         cookie_file: Optional path to Netscape format cookie file for authentication
         verbose: Whether to show detailed yt-dlp output
+        use_cache: Whether to reuse a recent listing cached on disk
+        cache_ttl: Maximum age of a cached listing in seconds
 
     Returns:
         List of video metadata dictionaries
@@ -33,6 +138,16 @@ def list_channel_videos(
     Raises:
         ChannelListingError: If listing fails
     """
+    # Deferred so the CLI starts quickly when no listing is needed
+    import yt_dlp
+
+    if use_cache:
+        cache_path = _cache_path(channel_url, cookie_file)
+        cached = _read_cache(cache_path, cache_ttl)
+        if cached is not None:
+            console.print(f"[green]✓[/green] Loaded {len(cached)} videos from cache")
+            return cached
+
     ydl_opts = {
         "extract_flat": "in_playlist",  # Don't download, just extract metadata
         "quiet": not verbose,
@@ -43,39 +158,61 @@ def list_channel_videos(
     if cookie_file:
         ydl_opts["cookiefile"] = str(cookie_file)
 
+    tab_urls = _channel_tab_urls(channel_url)
+    if len(tab_urls) > 1:
+        # Not every channel has every tab; don't report the missing ones
+        ydl_opts["logger"] = _TabLogger(verbose)
+
+    def _extract(url: str) -> Optional[Dict[str, Any]]:
+        # yt-dlp instances are not thread-safe, so each tab gets its own
+        with _open_ydl(ydl_opts) as ydl:
+            return ydl.extract_info(url, download=False)
+
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            console.print("[cyan]Fetching channel information...[/cyan]")
+        console.print("[cyan]Fetching channel information...[/cyan]")
 
-            # Extract channel/playlist info
-            info = ydl.extract_info(channel_url, download=False)
+        # Extract channel/playlist info, fetching channel tabs concurrently
+        with ThreadPoolExecutor(max_workers=len(tab_urls)) as pool:
+            infos = [info for info in pool.map(_extract, tab_urls) if info]
 
-            if not info:
-                raise ChannelListingError("Could not extract channel information")
+        if not infos:
+            raise ChannelListingError("Could not extract channel information")
 
-            # Check if authentication worked by looking for premium indicators
-            if cookie_file:
-                console.print("[green]✓[/green] Cookie file loaded successfully")
+        # Check if authentication worked by looking for premium indicators
+        if cookie_file:
+            console.print("[green]✓[/green] Cookie file loaded successfully")
 
-            # Handle both channel pages and playlists
-            if "entries" in info:
-                videos = list(info["entries"])
-                channel_title = info.get("title", "Unknown Channel")
-            else:
-                # Single video
-                videos = [info]
-                channel_title = info.get("channel", "Unknown Channel")
+        # Handle both channel pages and playlists, filtering out None entries
+        # (removed/private videos) in the same pass
+        info = infos[0]
+        if "entries" not in info:
+            # Single video
+            videos = [info]
+            channel_title = info.get("channel", "Unknown Channel")
+        elif len(tab_urls) == 1:
+            videos = [v for v in info["entries"] if v is not None]
+            channel_title = info.get("title", "Unknown Channel")
+        else:
+            # Tabs can overlap, e.g. a finished premiere may show under videos and streams
+            unique = {}
+            for tab_info in infos:
+                for video in tab_info.get("entries") or []:
+                    if video is not None:
+                        unique.setdefault(video.get("id"), video)
+            videos = list(unique.values())
+            # Tab titles read "<channel> - Videos"
+            channel_title = info.get("channel") or info.get("title", "Unknown Channel")
 
-            # Filter out None entries (removed/private videos)
-            videos = [v for v in videos if v is not None]
+        console.print(f"[green]✓[/green] Found {len(videos)} videos in '{channel_title}'")
 
-            console.print(f"[green]✓[/green] Found {len(videos)} videos in '{channel_title}'")
+        if use_cache:
+            _write_cache(cache_path, videos)
 
-            return videos
+        return videos
 
     except yt_dlp.utils.DownloadError as e:
         error_msg = str(e)
-        if "Sign in" in error_msg or "login" in error_msg.lower():
+        if _AUTH_RE.search(error_msg):
             raise ChannelListingError(
                 "Authentication required. Please provide a valid YouTube Premium cookie file."
             )
@@ -84,6 +221,38 @@ def list_channel_videos(
         raise ChannelListingError(f"Unexpected error listing channel: {str(e)}")
 
 
+async def list_channel_videos_async(
+    channel_url: str,
+    cookie_file: Optional[Path] = None,
+    verbose: bool = False,
+    use_cache: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    List all videos from a YouTube channel without blocking the event loop.
+
+    Runs list_channel_videos in a worker thread, so several channels can be
+    listed concurrently with asyncio.gather.
+
+    Args:
+        channel_url: URL of the YouTube channel or playlist
+        cookie_file: Optional path to Netscape format cookie file for authentication
+        verbose: Whether to show detailed yt-dlp output
+        use_cache: Whether to reuse a recent listing cached on disk
+
+    Returns:
+        List of video metadata dictionaries
+
+    Raises:
+        ChannelListingError: If listing fails
+    """
+    # The coroutine only runs inside an event loop, so asyncio is already loaded;
+    # a module-level import would cost every CLI start
+    asyncio = sys.modules["asyncio"]
+    return await asyncio.to_thread(
+        list_channel_videos, channel_url, cookie_file, verbose, use_cache
+    )
+
+
 def display_video_table(videos: List[Dict[str, Any]], max_rows: Optional[int] = None) -> None:
     """
     Display videos in a formatted table.
@@ -92,15 +261,15 @@ def display_video_table(videos: List[Dict[str, Any]], max_rows: Optional[int] =
         videos: List of video metadata dictionaries
         max_rows: Maximum number of rows to display (None for all)
     """
+    from rich.table import Table
+
     table = Table(title="Channel Videos")
     table.add_column("#", style="cyan", width=6)
     table.add_column("Video ID", style="yellow", width=15)
     table.add_column("Title", style="green")
     table.add_column("Duration", style="blue", width=10)
 
-    display_videos = videos[:max_rows] if max_rows else videos
-
-    for idx, video in enumerate(display_videos, 1):
+    for idx, video in enumerate(islice(videos, max_rows or None), 1):
         video_id = video.get("id", "N/A")
         title = video.get("title", "Unknown Title")
         duration = video.get("duration")
@@ -108,14 +277,11 @@ def display_video_table(videos: List[Dict[str, Any]], max_rows: Optional[int] =
         # Format duration as MM:SS or HH:MM:SS
         if duration is not None and duration > 0:
             # Convert to int to handle float values
-            duration = int(duration)
-            hours = duration // 3600
-            minutes = (duration % 3600) // 60
-            seconds = duration % 60
-            if hours > 0:
-                duration_str = f"{hours}:{minutes:02d}:{seconds:02d}"
-            else:
-                duration_str = f"{minutes}:{seconds:02d}"
+            minutes, seconds = divmod(int(duration), 60)
+            hours, minutes = divmod(minutes, 60)
+            duration_str = (
+                f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+            )
         else:
             duration_str = "N/A"
 
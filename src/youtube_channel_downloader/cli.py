@@ -1,12 +1,13 @@
 """Command-line interface for YouTube Channel Downloader."""
 
-from typing import Optional
+from typing import List, Optional
 import typer
 from rich.console import Console
 
 from youtube_channel_downloader.cookie_validator import validate_cookie_file, CookieValidationError
 from youtube_channel_downloader.channel_lister import (
     list_channel_videos,
+    list_channel_videos_async,
     display_video_table,
     ChannelListingError,
 )
@@ -35,6 +36,11 @@ def main(
         "-n",
         help="Maximum number of videos to display in table (0 for all)",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Fetch a fresh channel listing instead of one cached in the last hour",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -61,6 +67,7 @@ def main(
             channel_url=channel_url,
             cookie_file=cookie_path,
             verbose=verbose,
+            use_cache=not no_cache,
         )
 
         if not videos:
@@ -89,6 +96,86 @@ def main(
         raise typer.Exit(code=1)
 
 
+def list_many(
+    channel_urls: List[str] = typer.Argument(..., help="One or more YouTube channel URLs"),
+    cookie_file: Optional[str] = typer.Option(
+        None,
+        "--cookie-file",
+        "-c",
+        help="Path to Netscape format cookie file for YouTube Premium authentication",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Fetch a fresh channel listing instead of one cached in the last hour",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Show detailed yt-dlp output",
+    ),
+):
+    """
+    Count the videos in several YouTube channels at once.
+
+    Channels are fetched concurrently; a failure in one channel does not
+    stop the others.
+    """
+    try:
+        # Validate cookie file if provided
+        cookie_path = None
+        if cookie_file:
+            console.print("[cyan]Validating cookie file...[/cyan]")
+            cookie_path = validate_cookie_file(cookie_file)
+            console.print(f"[green]✓[/green] Cookie file validated: {cookie_path}")
+
+        import asyncio
+
+        async def list_all():
+            return await asyncio.gather(
+                *(
+                    list_channel_videos_async(url, cookie_path, verbose, not no_cache)
+                    for url in channel_urls
+                ),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(list_all())
+
+        console.print()
+        total = 0
+        failed = 0
+        for url, result in zip(channel_urls, results):
+            if isinstance(result, ChannelListingError):
+                console.print(f"[red]✗[/red] {url}: {result}")
+                failed += 1
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                console.print(f"[green]✓[/green] {url}: {len(result)} videos")
+                total += len(result)
+
+        console.print(f"\n[green]Total videos: {total}[/green]")
+
+        if failed:
+            raise typer.Exit(code=1)
+
+    except CookieValidationError as e:
+        console.print(f"[red]Cookie validation error:[/red] {e}")
+        raise typer.Exit(code=1)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Cancelled by user[/yellow]")
+        raise typer.Exit(code=130)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        if verbose:
+            raise
+        raise typer.Exit(code=1)
+
+
 def download(
     channel_url: str = typer.Argument(
         ..., help="YouTube channel URL (e.g., https://www.youtube.com/@channelname/videos)"
@@ -115,6 +202,18 @@ def download(
         "--skip-existing/--no-skip-existing",
         help="Skip videos that are already downloaded (default: enabled)",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Fetch a fresh channel listing instead of one cached in the last hour",
+    ),
+    max_concurrent: int = typer.Option(
+        1,
+        "--max-concurrent",
+        "-j",
+        min=1,
+        help="Number of videos to download in parallel",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -142,6 +241,7 @@ def download(
             channel_url=channel_url,
             cookie_file=cookie_path,
             verbose=verbose,
+            use_cache=not no_cache,
         )
 
         if not videos:
@@ -157,6 +257,7 @@ def download(
             cookie_file=cookie_path,
             dry_run=dry_run,
             skip_existing=skip_existing,
+            max_concurrent=max_concurrent,
             verbose=verbose,
         )
 
@@ -194,6 +295,7 @@ app = typer.Typer(
 
 # Register commands
 app.command(name="list")(main)
+app.command(name="list-many")(list_many)
 app.command(name="download")(download)
 
 
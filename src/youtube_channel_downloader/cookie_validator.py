@@ -1,5 +1,6 @@
 """Cookie validation utilities for YouTube Premium authentication."""
 
+import os
 from pathlib import Path
 
 
@@ -33,18 +34,20 @@ def validate_cookie_file(cookie_path: str) -> Path:
     if not path.stat().st_size > 0:
         raise CookieValidationError(f"Cookie file is empty: {cookie_path}")
 
-    # Check if file is readable
+    # Check if file is readable by sniffing a small prefix; no decoding needed
     try:
-        with open(path, "r") as f:
-            first_line = f.readline().strip()
-            # Netscape cookie files should start with a comment
-            if not first_line.startswith("#"):
-                raise CookieValidationError(
-                    f"Cookie file does not appear to be in Netscape format: {cookie_path}"
-                )
-    except PermissionError:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            prefix = os.read(fd, 16)
+        finally:
+            os.close(fd)
+    except OSError:
         raise CookieValidationError(f"Cookie file is not readable: {cookie_path}")
-    except UnicodeDecodeError:
-        raise CookieValidationError(f"Cookie file is not a valid text file: {cookie_path}")
+
+    # Netscape cookie files should start with a comment
+    if not prefix.lstrip().startswith(b"#"):
+        raise CookieValidationError(
+            f"Cookie file does not appear to be in Netscape format: {cookie_path}"
+        )
 
     return path
@@ -1,22 +1,21 @@
 """Video downloading functionality using yt-dlp."""
 
 import csv
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
-import yt_dlp
 from rich.console import Console
-from rich.progress import (
-    Progress,
-    BarColumn,
-    DownloadColumn,
-    TransferSpeedColumn,
-    TimeRemainingColumn,
-)
 
 
 console = Console()
 
+# Metadata rows are flushed to disk in batches of this size
+CSV_FLUSH_EVERY = 16
+
 
 class DownloadError(Exception):
     """Raised when video download fails."""
@@ -24,6 +23,21 @@ class DownloadError(Exception):
     pass
 
 
+def _csv_field(value: Any) -> str:
+    """Format a value as a CSV field, quoting only when needed (as csv.QUOTE_MINIMAL does)."""
+    if value is None:
+        return ""
+    text = str(value)
+    if "," in text or '"' in text or "\n" in text or "\r" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _csv_row(values: Iterable[Any]) -> str:
+    """Format values as one CSV line, matching csv.writer's default dialect."""
+    return ",".join(map(_csv_field, values)) + "\r\n"
+
+
 def download_videos(
     videos: List[Dict[str, Any]],
     output_dir: str = "downloads",
@@ -41,7 +55,7 @@ def download_videos(
         output_dir: Directory to save downloaded videos
         cookie_file: Optional path to cookie file for authentication
         dry_run: If True, only simulate downloads without actually downloading
-        max_concurrent: Number of concurrent downloads (currently supports 1)
+        max_concurrent: Number of videos to download in parallel
         verbose: Whether to show detailed yt-dlp output
         skip_existing: If True, skip videos that are already downloaded
 
@@ -51,6 +65,17 @@ def download_videos(
     Raises:
         DownloadError: If download fails
     """
+    # Deferred so the CLI starts quickly when nothing is downloaded
+    import yt_dlp
+    from rich.progress import (
+        Progress,
+        BarColumn,
+        DownloadColumn,
+        TransferSpeedColumn,
+        TimeRemainingColumn,
+        TaskID,
+    )
+
     # Create output directory
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -83,25 +108,41 @@ def download_videos(
     if dry_run:
         ydl_opts["simulate"] = True
 
-    # Prepare CSV file for metadata
+    # Prepare CSV file for metadata, plus a one-ID-per-line sidecar that makes
+    # resume checks cheap without parsing the CSV
     csv_path = output_path / "videos_metadata.csv"
+    ids_path = output_path / "videos_metadata.ids"
     csv_exists = csv_path.exists()
 
-    # Load already downloaded video IDs from CSV if skip_existing is enabled
-    downloaded_ids = set()
-    if skip_existing and csv_exists:
+    # Seed the sidecar from CSVs written before it existed
+    if csv_exists and not ids_path.exists():
         try:
             with open(csv_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    downloaded_ids.add(row["video_id"])
-            if downloaded_ids:
-                console.print(
-                    f"[cyan]Found {len(downloaded_ids)} already downloaded videos - will skip them[/cyan]"
+                ids_path.write_text(
+                    "".join(f"{row['video_id']}\n" for row in csv.DictReader(f)),
+                    encoding="utf-8",
                 )
         except Exception as e:
             console.print(f"[yellow]Warning: Could not read existing CSV: {e}[/yellow]")
 
+    # Collect already downloaded video IDs once if skip_existing is enabled: IDs
+    # recorded in the sidecar plus finished .mp4 files (snapshotted with one
+    # directory read instead of a stat per video)
+    already_downloaded = set()
+    if skip_existing:
+        if ids_path.exists():
+            already_downloaded.update(ids_path.read_text(encoding="utf-8").splitlines())
+        with os.scandir(output_path) as entries:
+            already_downloaded.update(
+                entry.name[:-4]
+                for entry in entries
+                if entry.name.endswith(".mp4") and entry.is_file()
+            )
+        if already_downloaded:
+            console.print(
+                f"[cyan]Found {len(already_downloaded)} already downloaded videos - will skip them[/cyan]"
+            )
+
     # CSV headers
     csv_headers = [
         "video_id",
@@ -126,129 +167,224 @@ def download_videos(
 
     # Open CSV file for appending
     csv_file = open(csv_path, "a", newline="", encoding="utf-8")
-    csv_writer = csv.DictWriter(csv_file, fieldnames=csv_headers, extrasaction="ignore")
+    ids_file = open(ids_path, "a", encoding="utf-8")
+    rows_since_flush = 0
 
     # Write header if new file
     if not csv_exists or csv_path.stat().st_size == 0:
-        csv_writer.writeheader()
+        csv_file.write(_csv_row(csv_headers))
+
+    # All rows from one run share the run's start time
+    run_timestamp = datetime.now().isoformat()
+
+    stop = threading.Event()
+    cancelled = threading.Event()
+
+    # Each worker thread reuses one YoutubeDL (they are not thread-safe) so
+    # extractor setup and connection pools are paid once per thread, not per video
+    local = threading.local()
+    ydl_stack = ExitStack()
+    ydl_stack_lock = threading.Lock()
+    # The shared progress hook finds each video's progress bar by its ID
+    task_ids: Dict[str, TaskID] = {}
+
+    def progress_hook(d):
+        if cancelled.is_set():
+            raise yt_dlp.utils.DownloadCancelled()
+        task_id = task_ids.get(d.get("info_dict", {}).get("id"))
+        if task_id is None:
+            return
+        if d["status"] == "downloading":
+            if "total_bytes" in d:
+                downloaded = d.get("downloaded_bytes", 0)
+                total = d["total_bytes"]
+                percent = (downloaded / total) * 100
+                progress.update(task_id, completed=percent)
+            elif "total_bytes_estimate" in d:
+                downloaded = d.get("downloaded_bytes", 0)
+                total = d["total_bytes_estimate"]
+                percent = (downloaded / total) * 100
+                progress.update(task_id, completed=percent)
+        elif d["status"] == "finished":
+            progress.update(task_id, completed=100)
+
+    ydl_opts["progress_hooks"] = [progress_hook]
+
+    def _get_ydl() -> yt_dlp.YoutubeDL:
+        """Return this worker thread's YoutubeDL, creating it on first use."""
+        if not hasattr(local, "ydl"):
+            with ydl_stack_lock:
+                local.ydl = ydl_stack.enter_context(yt_dlp.YoutubeDL(ydl_opts))
+        return local.ydl
+
+    def _run(
+        idx: int, video: Dict[str, Any]
+    ) -> Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Download a single video, returning (video_info, error) or None if not started."""
+        if stop.is_set():
+            return None
+
+        video_id = video["id"]
+        video_title = video.get("title", "Unknown Title")
+        # Flat listing entries carry their page URL (watch, shorts, ...), while on a
+        # processed video "url" is the selected media stream, so use its webpage_url
+        if video.get("_type") == "url" and video.get("url"):
+            video_url = video["url"]
+        else:
+            video_url = video.get("webpage_url") or f"https://www.youtube.com/watch?v={video_id}"
+
+        console.print(f"[cyan][{idx}/{len(videos)}][/cyan] {video_title}")
+        task_id = progress.add_task(video_title, total=100)
+        task_ids[video_id] = task_id
 
-    try:
-        # Download each video
+        try:
+            # Extract full video info for metadata
+            return _get_ydl().extract_info(video_url, download=not dry_run), None
+        except Exception as e:
+            # Don't start any queued downloads once one has failed
+            stop.set()
+            return None, str(e)
+        finally:
+            # Remove this worker's own bar, not whatever the shared dict now holds
+            task_ids.pop(video_id, None)
+            progress.remove_task(task_id)
+
+    def _record(
+        video: Dict[str, Any],
+        result: Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]],
+    ) -> None:
+        """Record a finished download in the stats, CSV and sidecar."""
+        nonlocal rows_since_flush
+        if result is None:
+            # Never started because an earlier download failed
+            return
+        video_id = video["id"]
+        video_title = video.get("title", "Unknown Title")
+        video_info, error_msg = result
+
+        if error_msg is not None:
+            stats["failed"] += 1
+            stats["failed_videos"].append(
+                {"id": video_id, "title": video_title, "error": error_msg}
+            )
+            console.print(f"[red]✗[/red] Failed: {video_title}: {error_msg}\n")
+            console.print("[red]Stopping due to download error[/red]")
+            return
+
+        # Write metadata to CSV
+        if video_info:
+            metadata = {
+                "video_id": video_info.get("id", video_id),
+                "title": video_info.get("title", ""),
+                "description": video_info.get("description", ""),
+                "upload_date": video_info.get("upload_date", ""),
+                "duration": video_info.get("duration", ""),
+                "view_count": video_info.get("view_count", ""),
+                "like_count": video_info.get("like_count", ""),
+                "channel": video_info.get("channel", ""),
+                "channel_id": video_info.get("channel_id", ""),
+                "uploader": video_info.get("uploader", ""),
+                "thumbnail": video_info.get("thumbnail", ""),
+                "width": video_info.get("width", ""),
+                "height": video_info.get("height", ""),
+                "fps": video_info.get("fps", ""),
+                "video_codec": video_info.get("vcodec", ""),
+                "audio_codec": video_info.get("acodec", ""),
+                "filesize": video_info.get("filesize", video_info.get("filesize_approx", "")),
+                "download_timestamp": run_timestamp,
+            }
+            csv_file.write(_csv_row(metadata[key] for key in csv_headers))
+            ids_file.write(f"{metadata['video_id']}\n")
+            rows_since_flush += 1
+            if rows_since_flush == CSV_FLUSH_EVERY:
+                # CSV first, so the sidecar never lists an ID without its row
+                csv_file.flush()
+                ids_file.flush()
+                rows_since_flush = 0
+
+        stats["success"] += 1
+        console.print(f"[green]✓[/green] Downloaded successfully: {video_title}\n")
+
+    def _queued() -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (index, video) for each video to download, reporting skipped ones."""
+        queued = set()
         for idx, video in enumerate(videos, 1):
-            video_id = video.get("id", "unknown")
+            video_id = video.get("id")
             video_title = video.get("title", "Unknown Title")
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+            if not video_id:
+                stats["failed"] += 1
+                stats["failed_videos"].append(
+                    {"id": "unknown", "title": video_title, "error": "Missing video ID"}
+                )
+                console.print(f"[red][{idx}/{len(videos)}][/red] {video_title}")
+                console.print("[red]✗[/red] Missing video ID - skipping\n")
+                continue
 
             # Check if video is already downloaded
-            if skip_existing and video_id in downloaded_ids:
+            if video_id in already_downloaded:
                 console.print(f"[yellow][{idx}/{len(videos)}][/yellow] {video_title}")
                 console.print("[yellow]⊘ Already downloaded - skipping[/yellow]\n")
                 stats["skipped"] += 1
                 continue
 
-            # Check if video file already exists
-            if skip_existing:
-                video_file = output_path / f"{video_id}.mp4"
-                if video_file.exists():
-                    console.print(f"[yellow][{idx}/{len(videos)}][/yellow] {video_title}")
-                    console.print("[yellow]⊘ File already exists - skipping[/yellow]\n")
-                    stats["skipped"] += 1
-                    # Add to downloaded_ids to track it
-                    downloaded_ids.add(video_id)
-                    continue
+            # Playlists can repeat a video; queue each ID once so parallel
+            # workers never share a progress bar or download the same file
+            if video_id in queued:
+                console.print(f"[yellow][{idx}/{len(videos)}][/yellow] {video_title}")
+                console.print("[yellow]⊘ Duplicate entry - skipping[/yellow]\n")
+                stats["skipped"] += 1
+                continue
 
-            console.print(f"[cyan][{idx}/{len(videos)}][/cyan] {video_title}")
+            queued.add(video_id)
+            yield idx, video
 
+    try:
+        with Progress(
+            "[progress.description]{task.description}",
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=console,
+            # Cap repaints; yt-dlp reports progress far more often than this
+            refresh_per_second=4,
+            transient=True,
+        ) as progress:
             try:
-                # Create progress tracking
-                video_info = None
-                with Progress(
-                    "[progress.description]{task.description}",
-                    BarColumn(),
-                    DownloadColumn(),
-                    TransferSpeedColumn(),
-                    TimeRemainingColumn(),
-                    console=console,
-                ) as progress:
-
-                    task_id = progress.add_task("Downloading...", total=100)
-
-                    def progress_hook(d):
-                        if d["status"] == "downloading":
-                            if "total_bytes" in d:
-                                downloaded = d.get("downloaded_bytes", 0)
-                                total = d["total_bytes"]
-                                percent = (downloaded / total) * 100
-                                progress.update(task_id, completed=percent)
-                            elif "total_bytes_estimate" in d:
-                                downloaded = d.get("downloaded_bytes", 0)
-                                total = d["total_bytes_estimate"]
-                                percent = (downloaded / total) * 100
-                                progress.update(task_id, completed=percent)
-                        elif d["status"] == "finished":
-                            progress.update(task_id, completed=100)
-
-                    ydl_opts["progress_hooks"] = [progress_hook]
-
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        # Extract full video info for metadata
-                        video_info = ydl.extract_info(video_url, download=not dry_run)
-
-                # Write metadata to CSV
-                if video_info:
-                    metadata = {
-                        "video_id": video_info.get("id", video_id),
-                        "title": video_info.get("title", ""),
-                        "description": video_info.get("description", ""),
-                        "upload_date": video_info.get("upload_date", ""),
-                        "duration": video_info.get("duration", ""),
-                        "view_count": video_info.get("view_count", ""),
-                        "like_count": video_info.get("like_count", ""),
-                        "channel": video_info.get("channel", ""),
-                        "channel_id": video_info.get("channel_id", ""),
-                        "uploader": video_info.get("uploader", ""),
-                        "thumbnail": video_info.get("thumbnail", ""),
-                        "width": video_info.get("width", ""),
-                        "height": video_info.get("height", ""),
-                        "fps": video_info.get("fps", ""),
-                        "video_codec": video_info.get("vcodec", ""),
-                        "audio_codec": video_info.get("acodec", ""),
-                        "filesize": video_info.get(
-                            "filesize", video_info.get("filesize_approx", "")
-                        ),
-                        "download_timestamp": datetime.now().isoformat(),
-                    }
-                    csv_writer.writerow(metadata)
-                    csv_file.flush()  # Ensure data is written immediately
-
-                stats["success"] += 1
-                console.print("[green]✓[/green] Downloaded successfully\n")
-
-            except yt_dlp.utils.DownloadError as e:
-                error_msg = str(e)
-                stats["failed"] += 1
-                stats["failed_videos"].append(
-                    {"id": video_id, "title": video_title, "error": error_msg}
-                )
-                console.print(f"[red]✗[/red] Failed: {error_msg}\n")
-                console.print("[red]Stopping due to download error[/red]")
-                break  # Stop on download error
+                if max_concurrent == 1:
+                    # Download on this thread, so Ctrl-C interrupts the download itself
+                    # rather than a wait on a worker
+                    for idx, video in _queued():
+                        _record(video, _run(idx, video))
+                else:
+                    pool = ThreadPoolExecutor(max_workers=max_concurrent)
+                    try:
+                        futures = {pool.submit(_run, idx, video): video for idx, video in _queued()}
+                        # Results are drained on this thread only, so the CSV writer and
+                        # stats never need locking
+                        for future in as_completed(futures):
+                            _record(futures[future], future.result())
+                    except KeyboardInterrupt:
+                        cancelled.set()
+                        raise
+                    finally:
+                        # After Ctrl-C, don't block on in-flight downloads; their progress
+                        # hooks abort them once cancelled is set
+                        pool.shutdown(wait=not cancelled.is_set(), cancel_futures=True)
 
             except KeyboardInterrupt:
+                # Abort in-flight downloads via their progress hooks
+                stop.set()
+                cancelled.set()
                 console.print("\n[yellow]Download cancelled by user[/yellow]")
                 raise
 
-            except Exception as e:
-                stats["failed"] += 1
-                stats["failed_videos"].append(
-                    {"id": video_id, "title": video_title, "error": str(e)}
-                )
-                console.print(f"[red]✗[/red] Unexpected error: {e}\n")
-                console.print("[red]Stopping due to unexpected error[/red]")
-                break  # Stop on unexpected error
-
     finally:
+        # Closing flushes any partial batch, CSV before sidecar
         csv_file.close()
+        ids_file.close()
+        ydl_stack.close()
 
     return stats
 
@@ -0,0 +1,29 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+from unittest.mock import Mock, MagicMock
+import yt_dlp
+from yt_dlp import YoutubeDL
+
+
+@pytest.fixture(scope="session")
+def ydl_spec():
+    """YoutubeDL attribute names, computed once for spec'd mocks."""
+    return dir(YoutubeDL)
+
+
+@pytest.fixture
+def ydl_mock(ydl_spec):
+    """YoutubeDL instance mock that works as a context manager."""
+    mock_ydl = MagicMock(spec=ydl_spec)
+    # MagicMock's default __exit__ returns False, so exceptions still propagate
+    mock_ydl.__enter__.return_value = mock_ydl
+    return mock_ydl
+
+
+@pytest.fixture
+def mock_ydl_class(ydl_mock, monkeypatch):
+    """Replace yt_dlp.YoutubeDL with a mock that returns ydl_mock."""
+    mock_class = Mock(return_value=ydl_mock)
+    monkeypatch.setattr(yt_dlp, "YoutubeDL", mock_class)
+    return mock_class
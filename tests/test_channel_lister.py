@@ -1,13 +1,18 @@
 """Tests for channel listing functionality."""
 
+import threading
+import time
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 from pathlib import Path
+import yt_dlp.utils
 
+from youtube_channel_downloader import channel_lister
 from youtube_channel_downloader.channel_lister import (
     list_channel_videos,
     display_video_table,
     ChannelListingError,
+    _channel_tab_urls,
 )
 
 
@@ -38,14 +43,9 @@ def mock_channel_info():
     }
 
 
-@patch("youtube_channel_downloader.channel_lister.yt_dlp.YoutubeDL")
-def test_list_channel_videos_success(mock_ydl_class, mock_channel_info):
+def test_list_channel_videos_success(mock_ydl_class, ydl_mock, mock_channel_info):
     """Test successful channel video listing."""
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value=mock_channel_info)
-    mock_ydl_class.return_value = mock_ydl
+    ydl_mock.extract_info = Mock(return_value=mock_channel_info)
 
     videos = list_channel_videos("https://youtube.com/@testchannel")
 
@@ -55,14 +55,9 @@ def test_list_channel_videos_success(mock_ydl_class, mock_channel_info):
     assert videos[1]["duration"] == 3600
 
 
-@patch("youtube_channel_downloader.channel_lister.yt_dlp.YoutubeDL")
-def test_list_channel_videos_with_cookie(mock_ydl_class, mock_channel_info):
+def test_list_channel_videos_with_cookie(mock_ydl_class, ydl_mock, mock_channel_info):
     """Test channel listing with cookie file."""
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value=mock_channel_info)
-    mock_ydl_class.return_value = mock_ydl
+    ydl_mock.extract_info = Mock(return_value=mock_channel_info)
 
     cookie_path = Path("/fake/cookies.txt")
     videos = list_channel_videos("https://youtube.com/@testchannel", cookie_file=cookie_path)
@@ -74,8 +69,7 @@ def test_list_channel_videos_with_cookie(mock_ydl_class, mock_channel_info):
     assert len(videos) == 3
 
 
-@patch("youtube_channel_downloader.channel_lister.yt_dlp.YoutubeDL")
-def test_list_channel_videos_filters_none_entries(mock_ydl_class):
+def test_list_channel_videos_filters_none_entries(mock_ydl_class, ydl_mock):
     """Test that None entries (private/removed videos) are filtered out."""
     mock_info = {
         "title": "Test Channel",
@@ -88,11 +82,7 @@ def test_list_channel_videos_filters_none_entries(mock_ydl_class):
         ],
     }
 
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value=mock_info)
-    mock_ydl_class.return_value = mock_ydl
+    ydl_mock.extract_info = Mock(return_value=mock_info)
 
     videos = list_channel_videos("https://youtube.com/@testchannel")
 
@@ -100,41 +90,144 @@ def test_list_channel_videos_filters_none_entries(mock_ydl_class):
     assert all(v is not None for v in videos)
 
 
-@patch("youtube_channel_downloader.channel_lister.yt_dlp.YoutubeDL")
-def test_list_channel_videos_authentication_error(mock_ydl_class):
-    """Test handling of authentication errors."""
-    import yt_dlp.utils
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        (
+            "https://www.youtube.com/@testchannel",
+            [
+                "https://www.youtube.com/@testchannel/videos",
+                "https://www.youtube.com/@testchannel/shorts",
+                "https://www.youtube.com/@testchannel/streams",
+            ],
+        ),
+        (
+            "https://youtube.com/channel/UC1234567890/",
+            [
+                "https://youtube.com/channel/UC1234567890/videos",
+                "https://youtube.com/channel/UC1234567890/shorts",
+                "https://youtube.com/channel/UC1234567890/streams",
+            ],
+        ),
+        (
+            "https://www.youtube.com/@testchannel/videos",
+            ["https://www.youtube.com/@testchannel/videos"],
+        ),
+        (
+            "https://www.youtube.com/playlist?list=PL123",
+            ["https://www.youtube.com/playlist?list=PL123"],
+        ),
+    ],
+)
+def test_channel_tab_urls(url, expected):
+    """Test that only bare channel URLs are split into tabs."""
+    assert _channel_tab_urls(url) == expected
+
+
+def test_list_channel_videos_merges_tabs(mock_ydl_class, ydl_mock):
+    """Test that channel tabs are merged, deduplicated, and missing tabs ignored."""
+    tab_infos = {
+        "videos": {
+            "title": "Test Channel - Videos",
+            "channel": "Test Channel",
+            "entries": [{"id": "video1"}, {"id": "video2"}],
+        },
+        "shorts": None,  # Channel has no shorts tab
+        "streams": {"title": "Test Channel - Live", "entries": [{"id": "video2"}, {"id": "live1"}]},
+    }
+
+    ydl_mock.extract_info = Mock(side_effect=lambda url, download: tab_infos[url.rsplit("/", 1)[1]])
+
+    videos = list_channel_videos("https://www.youtube.com/@testchannel")
+
+    assert [v["id"] for v in videos] == ["video1", "video2", "live1"]
+    assert ydl_mock.extract_info.call_count == 3
+
 
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(
-        side_effect=yt_dlp.utils.DownloadError("Sign in to confirm your age")
+def test_list_channel_videos_cookie_file_single_writer(mock_ydl_class, ydl_mock):
+    """Test that parallel tab fetches never rewrite the cookie file at the same time."""
+    # All three tab instances are open at once before any of them closes
+    barrier = threading.Barrier(3, timeout=5)
+    lock = threading.Lock()
+    writers = []
+    active = 0
+
+    def extract_info(url, download):
+        barrier.wait()
+        return {"title": "Test Channel", "entries": [{"id": url.rsplit("/", 1)[1]}]}
+
+    def close(*args):
+        nonlocal active
+        with lock:
+            active += 1
+            writers.append(active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return False
+
+    ydl_mock.extract_info = Mock(side_effect=extract_info)
+    ydl_mock.__exit__.side_effect = close
+
+    videos = list_channel_videos(
+        "https://www.youtube.com/@testchannel", cookie_file=Path("/fake/cookies.txt")
     )
-    mock_ydl_class.return_value = mock_ydl
+
+    assert len(videos) == 3
+    assert writers == [1, 1, 1]
+
+
+def test_list_channel_videos_cache(
+    mock_ydl_class, ydl_mock, mock_channel_info, tmp_path, monkeypatch
+):
+    """Test that a cached listing is reused until it expires."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    ydl_mock.extract_info = Mock(return_value=mock_channel_info)
+
+    url = "https://youtube.com/@testchannel/videos"
+    first = list_channel_videos(url, use_cache=True)
+    second = list_channel_videos(url, use_cache=True)
+
+    assert second == first
+    assert ydl_mock.extract_info.call_count == 1
+
+    # Expired entries and uncached calls go back to yt-dlp
+    list_channel_videos(url, use_cache=True, cache_ttl=0)
+    list_channel_videos(url)
+    assert ydl_mock.extract_info.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Sign in to confirm your age",
+        "This video is available to this channel's members. Please sign-in",
+        "Use --cookies for the authentication",
+        "LOGIN_REQUIRED",
+    ],
+)
+def test_list_channel_videos_authentication_error(mock_ydl_class, ydl_mock, message):
+    """Test handling of authentication errors."""
+    ydl_mock.extract_info = Mock(side_effect=yt_dlp.utils.DownloadError(message))
 
     with pytest.raises(ChannelListingError, match="Authentication required"):
         list_channel_videos("https://youtube.com/@testchannel")
 
 
-@patch("youtube_channel_downloader.channel_lister.yt_dlp.YoutubeDL")
-def test_list_channel_videos_generic_error(mock_ydl_class):
+def test_list_channel_videos_generic_error(mock_ydl_class, ydl_mock):
     """Test handling of generic yt-dlp errors."""
-    import yt_dlp.utils
-
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(side_effect=yt_dlp.utils.DownloadError("Channel not found"))
-    mock_ydl_class.return_value = mock_ydl
+    ydl_mock.extract_info = Mock(side_effect=yt_dlp.utils.DownloadError("Channel not found"))
 
     with pytest.raises(ChannelListingError, match="Failed to list channel videos"):
         list_channel_videos("https://youtube.com/@testchannel")
 
 
-@patch("youtube_channel_downloader.channel_lister.console")
-def test_display_video_table(mock_console):
+def test_display_video_table(monkeypatch):
     """Test video table display."""
+    mock_console = Mock()
+    monkeypatch.setattr(channel_lister, "console", mock_console)
+
     videos = [
         {"id": "vid1", "title": "Video 1", "duration": 180},
         {"id": "vid2", "title": "Video 2", "duration": 3665},  # 1:01:05
@@ -145,13 +238,20 @@ def test_display_video_table(mock_console):
 
     # Verify console.print was called with a Table
     assert mock_console.print.called
+    table = mock_console.print.call_args[0][0]
+    assert table.columns[3]._cells == ["3:00", "1:01:05", "N/A"]
 
 
-@patch("youtube_channel_downloader.channel_lister.console")
-def test_display_video_table_max_rows(mock_console):
+def test_display_video_table_max_rows(monkeypatch):
     """Test video table display with max rows limit."""
+    mock_console = Mock()
+    monkeypatch.setattr(channel_lister, "console", mock_console)
+
     videos = [{"id": f"vid{i}", "title": f"Video {i}", "duration": 100} for i in range(50)]
 
     display_video_table(videos, max_rows=10)
 
     assert mock_console.print.called
+    table = mock_console.print.call_args[0][0]
+    assert table.row_count == 10
+    assert table.caption == "Showing 10 of 50 videos"
@@ -1,46 +1,77 @@
 """Tests for CLI interface."""
 
 import pytest
+import typer
 from typer.testing import CliRunner
-from unittest.mock import patch
-import tempfile
-from pathlib import Path
+from unittest.mock import Mock
 
-from youtube_channel_downloader.cli import app
+from youtube_channel_downloader import channel_lister, cli
+from youtube_channel_downloader.cli import app, list_many, main
 
 
 runner = CliRunner()
 
+CHANNEL_URL = "https://youtube.com/@testchannel"
+
+# Shared read-only video list; copy it before mutating in a test
+MOCK_VIDEOS = [
+    {"id": "video1", "title": "Test Video 1", "duration": 180},
+    {"id": "video2", "title": "Test Video 2", "duration": 3600},
+]
+
+
+def run_list(**overrides):
+    """Call the list command directly with its defaults, bypassing argv parsing."""
+    kwargs = {
+        "channel_url": CHANNEL_URL,
+        "cookie_file": None,
+        "max_display": 20,
+        "no_cache": False,
+        "verbose": False,
+    }
+    kwargs.update(overrides)
+    main(**kwargs)
+
+
+def run_list_many(channel_urls, **overrides):
+    """Call the list-many command directly with its defaults, bypassing argv parsing."""
+    kwargs = {"cookie_file": None, "no_cache": False, "verbose": False}
+    kwargs.update(overrides)
+    list_many(channel_urls, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def valid_cookie_file(tmp_path_factory):
+    """Create a valid cookie file for testing, shared by all tests (none modify it)."""
+    cookie_file = tmp_path_factory.mktemp("cookies") / "cookies.txt"
+    cookie_file.write_bytes(
+        b"# Netscape HTTP Cookie File\n"
+        b".youtube.com\tTRUE\t/\tTRUE\t0\tcookie_name\tcookie_value\n"
+    )
+    return str(cookie_file)
 
-@pytest.fixture
-def valid_cookie_file():
-    """Create a valid cookie file for testing."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-        f.write("# Netscape HTTP Cookie File\n")
-        f.write(".youtube.com\tTRUE\t/\tTRUE\t0\tcookie_name\tcookie_value\n")
-        cookie_path = f.name
-
-    yield cookie_path
 
-    Path(cookie_path).unlink()
+@pytest.fixture
+def mock_list(monkeypatch):
+    """Replace the CLI's list_channel_videos with a mock."""
+    mock = Mock()
+    monkeypatch.setattr(cli, "list_channel_videos", mock)
+    return mock
 
 
 @pytest.fixture
-def mock_videos():
-    """Mock video list."""
-    return [
-        {"id": "video1", "title": "Test Video 1", "duration": 180},
-        {"id": "video2", "title": "Test Video 2", "duration": 3600},
-    ]
+def mock_display(monkeypatch):
+    """Replace the CLI's display_video_table with a mock."""
+    mock = Mock()
+    monkeypatch.setattr(cli, "display_video_table", mock)
+    return mock
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-@patch("youtube_channel_downloader.cli.display_video_table")
-def test_list_videos_basic(mock_display, mock_list, mock_videos):
-    """Test basic list-videos command."""
-    mock_list.return_value = mock_videos
+def test_list_videos_basic(mock_display, mock_list):
+    """Test basic list-videos command through the full argv parser."""
+    mock_list.return_value = MOCK_VIDEOS
 
-    result = runner.invoke(app, ["list", "https://youtube.com/@testchannel"])
+    result = runner.invoke(app, ["list", CHANNEL_URL], catch_exceptions=False)
 
     assert result.exit_code == 0
     assert mock_list.called
@@ -48,82 +79,124 @@ def test_list_videos_basic(mock_display, mock_list, mock_videos):
     assert "Total videos: 2" in result.stdout
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-@patch("youtube_channel_downloader.cli.display_video_table")
-def test_list_videos_with_cookie(mock_display, mock_list, mock_videos, valid_cookie_file):
+def test_list_videos_with_cookie(mock_display, mock_list, valid_cookie_file, capsys):
     """Test list-videos command with cookie file."""
-    mock_list.return_value = mock_videos
+    mock_list.return_value = MOCK_VIDEOS
 
-    result = runner.invoke(
-        app, ["list", "https://youtube.com/@testchannel", "--cookie-file", valid_cookie_file]
-    )
+    run_list(cookie_file=valid_cookie_file)
 
-    assert result.exit_code == 0
-    assert "Cookie file validated" in result.stdout
+    assert "Cookie file validated" in capsys.readouterr().out
     assert mock_list.called
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-def test_list_videos_invalid_cookie(mock_list):
+def test_list_videos_invalid_cookie(mock_list, capsys):
     """Test list-videos with invalid cookie file."""
-    result = runner.invoke(
-        app,
-        ["list", "https://youtube.com/@testchannel", "--cookie-file", "/nonexistent/cookies.txt"],
-    )
+    with pytest.raises(typer.Exit) as exc_info:
+        run_list(cookie_file="/nonexistent/cookies.txt")
 
-    assert result.exit_code == 1
-    assert "Cookie validation error" in result.stdout
+    assert exc_info.value.exit_code == 1
+    assert "Cookie validation error" in capsys.readouterr().out
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-@patch("youtube_channel_downloader.cli.display_video_table")
-def test_list_videos_no_videos(mock_display, mock_list):
+def test_list_videos_no_videos(mock_display, mock_list, capsys):
     """Test list-videos when channel has no videos."""
     mock_list.return_value = []
 
-    result = runner.invoke(app, ["list", "https://youtube.com/@testchannel"])
+    run_list()
 
-    assert result.exit_code == 0
-    assert "No videos found" in result.stdout
+    assert "No videos found" in capsys.readouterr().out
     assert not mock_display.called
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-def test_list_videos_channel_error(mock_list):
+def test_list_videos_channel_error(mock_list, capsys):
     """Test list-videos with channel listing error."""
     from youtube_channel_downloader.channel_lister import ChannelListingError
 
     mock_list.side_effect = ChannelListingError("Channel not found")
 
-    result = runner.invoke(app, ["list", "https://youtube.com/@testchannel"])
+    with pytest.raises(typer.Exit) as exc_info:
+        run_list()
 
-    assert result.exit_code == 1
-    assert "Channel listing error" in result.stdout
+    assert exc_info.value.exit_code == 1
+    assert "Channel listing error" in capsys.readouterr().out
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-@patch("youtube_channel_downloader.cli.display_video_table")
-def test_list_videos_max_display(mock_display, mock_list, mock_videos):
+def test_list_videos_max_display(mock_display, mock_list):
     """Test list-videos with max-display option."""
-    mock_list.return_value = mock_videos
+    mock_list.return_value = MOCK_VIDEOS
 
-    result = runner.invoke(app, ["list", "https://youtube.com/@testchannel", "--max-display", "1"])
+    run_list(max_display=1)
 
-    assert result.exit_code == 0
     # Verify max_rows was passed to display function
     call_args = mock_display.call_args
     assert call_args[1]["max_rows"] == 1
 
 
-@patch("youtube_channel_downloader.cli.list_channel_videos")
-@patch("youtube_channel_downloader.cli.display_video_table")
-def test_list_videos_verbose(mock_display, mock_list, mock_videos):
+def test_list_videos_verbose(mock_display, mock_list):
     """Test list-videos with verbose flag."""
-    mock_list.return_value = mock_videos
+    mock_list.return_value = MOCK_VIDEOS
 
-    result = runner.invoke(app, ["list", "https://youtube.com/@testchannel", "--verbose"])
+    run_list(verbose=True)
 
-    assert result.exit_code == 0
     # Verify verbose was passed
     call_args = mock_list.call_args
     assert call_args[1]["verbose"] is True
+    assert call_args[1]["use_cache"] is True
+
+
+def test_list_videos_no_cache(mock_display, mock_list):
+    """Test list-videos with the cache disabled."""
+    mock_list.return_value = MOCK_VIDEOS
+
+    run_list(no_cache=True)
+
+    assert mock_list.call_args[1]["use_cache"] is False
+
+
+def test_list_many(monkeypatch, capsys):
+    """Test listing several channels concurrently."""
+    mock_list = Mock(return_value=MOCK_VIDEOS)
+    monkeypatch.setattr(channel_lister, "list_channel_videos", mock_list)
+
+    run_list_many(["https://youtube.com/@channel1", "https://youtube.com/@channel2"])
+
+    output = capsys.readouterr().out
+    assert mock_list.call_count == 2
+    assert "https://youtube.com/@channel1: 2 videos" in output
+    assert "Total videos: 4" in output
+
+
+def test_list_many_partial_failure(monkeypatch, capsys):
+    """Test that one failing channel doesn't stop the others."""
+    from youtube_channel_downloader.channel_lister import ChannelListingError
+
+    def fake_list(channel_url, cookie_file, verbose, use_cache):
+        if channel_url.endswith("missing"):
+            raise ChannelListingError("Channel not found")
+        return MOCK_VIDEOS
+
+    monkeypatch.setattr(channel_lister, "list_channel_videos", fake_list)
+
+    with pytest.raises(typer.Exit) as exc_info:
+        run_list_many(["https://youtube.com/@channel1", "https://youtube.com/@missing"])
+
+    output = capsys.readouterr().out
+    assert exc_info.value.exit_code == 1
+    assert "Channel not found" in output
+    assert "Total videos: 2" in output
+
+
+def test_download_options(mock_list, monkeypatch):
+    """Test that download passes --max-concurrent and --no-cache through."""
+    mock_list.return_value = MOCK_VIDEOS
+    mock_download = Mock(return_value={"failed": 0})
+    monkeypatch.setattr(cli, "download_videos", mock_download)
+    monkeypatch.setattr(cli, "display_download_summary", Mock())
+
+    result = runner.invoke(
+        app, ["download", CHANNEL_URL, "-j", "3", "--no-cache"], catch_exceptions=False
+    )
+
+    assert result.exit_code == 0
+    assert mock_list.call_args[1]["use_cache"] is False
+    assert mock_download.call_args[1]["max_concurrent"] == 3
@@ -1,8 +1,9 @@
 """Tests for cookie validation functionality."""
 
+import os
 import pytest
 from pathlib import Path
-import tempfile
+from unittest.mock import Mock
 
 from youtube_channel_downloader.cookie_validator import (
     validate_cookie_file,
@@ -10,19 +11,17 @@ from youtube_channel_downloader.cookie_validator import (
 )
 
 
-def test_validate_cookie_file_success():
+def test_validate_cookie_file_success(tmp_path):
     """Test successful cookie file validation."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-        f.write("# Netscape HTTP Cookie File\n")
-        f.write(".youtube.com\tTRUE\t/\tTRUE\t0\tcookie_name\tcookie_value\n")
-        cookie_path = f.name
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_bytes(
+        b"# Netscape HTTP Cookie File\n"
+        b".youtube.com\tTRUE\t/\tTRUE\t0\tcookie_name\tcookie_value\n"
+    )
 
-    try:
-        result = validate_cookie_file(cookie_path)
-        assert isinstance(result, Path)
-        assert result.exists()
-    finally:
-        Path(cookie_path).unlink()
+    result = validate_cookie_file(str(cookie_file))
+    assert isinstance(result, Path)
+    assert result.exists()
 
 
 def test_validate_cookie_file_not_found():
@@ -31,49 +30,52 @@ def test_validate_cookie_file_not_found():
         validate_cookie_file("/nonexistent/path/cookies.txt")
 
 
-def test_validate_cookie_file_is_directory():
+def test_validate_cookie_file_is_directory(tmp_path):
     """Test validation when path is a directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        with pytest.raises(CookieValidationError, match="not a file"):
-            validate_cookie_file(tmpdir)
+    with pytest.raises(CookieValidationError, match="not a file"):
+        validate_cookie_file(str(tmp_path))
 
 
-def test_validate_cookie_file_empty():
+def test_validate_cookie_file_empty(tmp_path):
     """Test validation with empty file."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-        cookie_path = f.name
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.touch()
 
-    try:
-        with pytest.raises(CookieValidationError, match="Cookie file is empty"):
-            validate_cookie_file(cookie_path)
-    finally:
-        Path(cookie_path).unlink()
+    with pytest.raises(CookieValidationError, match="Cookie file is empty"):
+        validate_cookie_file(str(cookie_file))
 
 
-def test_validate_cookie_file_wrong_format():
+def test_validate_cookie_file_wrong_format(tmp_path):
     """Test validation with non-Netscape format file."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-        f.write("This is not a Netscape cookie file\n")
-        cookie_path = f.name
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_text("This is not a Netscape cookie file\n")
 
-    try:
-        with pytest.raises(CookieValidationError, match="not appear to be in Netscape format"):
-            validate_cookie_file(cookie_path)
-    finally:
-        Path(cookie_path).unlink()
+    with pytest.raises(CookieValidationError, match="not appear to be in Netscape format"):
+        validate_cookie_file(str(cookie_file))
 
 
-def test_validate_cookie_file_binary():
+def test_validate_cookie_file_binary(tmp_path):
     """Test validation with binary file."""
-    with tempfile.NamedTemporaryFile(mode="wb", suffix=".bin", delete=False) as f:
-        f.write(b"\x00\x01\x02\x03\x04")
-        cookie_path = f.name
-
-    try:
-        with pytest.raises(
-            CookieValidationError,
-            match="(not a valid text file|not appear to be in Netscape format)",
-        ):
-            validate_cookie_file(cookie_path)
-    finally:
-        Path(cookie_path).unlink()
+    cookie_file = tmp_path / "cookies.bin"
+    cookie_file.write_bytes(b"\x00\x01\x02\x03\x04")
+
+    with pytest.raises(CookieValidationError, match="not appear to be in Netscape format"):
+        validate_cookie_file(str(cookie_file))
+
+
+def test_validate_cookie_file_leading_whitespace(tmp_path):
+    """Test that whitespace before the header comment is accepted."""
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_bytes(b"\n  # Netscape HTTP Cookie File\n")
+
+    assert validate_cookie_file(str(cookie_file)) == cookie_file
+
+
+def test_validate_cookie_file_unreadable(tmp_path, monkeypatch):
+    """Test validation when the file cannot be opened."""
+    cookie_file = tmp_path / "cookies.txt"
+    cookie_file.write_bytes(b"# Netscape HTTP Cookie File\n")
+    monkeypatch.setattr(os, "open", Mock(side_effect=PermissionError("Permission denied")))
+
+    with pytest.raises(CookieValidationError, match="not readable"):
+        validate_cookie_file(str(cookie_file))
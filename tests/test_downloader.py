@@ -1,156 +1,375 @@
 """Tests for video downloader functionality."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 from pathlib import Path
-import tempfile
+import csv
+import io
+import threading
+import yt_dlp.utils
+from rich.progress import Progress
 
+from youtube_channel_downloader import downloader
 from youtube_channel_downloader.downloader import (
     download_videos,
     display_download_summary,
+    _csv_row,
+    CSV_FLUSH_EVERY,
 )
 
+MOCK_VIDEOS = [
+    {"id": "video1", "title": "Test Video 1", "duration": 180},
+    {"id": "video2", "title": "Test Video 2", "duration": 3600},
+]
 
-@pytest.fixture
-def mock_videos():
-    """Mock video list."""
-    return [
-        {"id": "video1", "title": "Test Video 1", "duration": 180},
-        {"id": "video2", "title": "Test Video 2", "duration": 3600},
-    ]
 
+@pytest.fixture
+def ydl_mock(ydl_mock):
+    """YoutubeDL mock whose downloads succeed by default."""
+    ydl_mock.extract_info = Mock(return_value={"id": "test", "title": "Test"})
+    return ydl_mock
 
-@patch("youtube_channel_downloader.downloader.yt_dlp.YoutubeDL")
-def test_download_videos_success(mock_ydl_class, mock_videos):
-    """Test successful video downloads."""
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value={"id": "test", "title": "Test"})
-    mock_ydl_class.return_value = mock_ydl
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        stats = download_videos(
-            videos=mock_videos,
-            output_dir=tmpdir,
-            dry_run=False,
-            verbose=False,
-        )
 
+def _check_success(stats, ydl_opts, output_dir):
     assert stats["total"] == 2
     assert stats["success"] == 2
     assert stats["failed"] == 0
     assert len(stats["failed_videos"]) == 0
 
 
-@patch("youtube_channel_downloader.downloader.yt_dlp.YoutubeDL")
-def test_download_videos_dry_run(mock_ydl_class, mock_videos):
-    """Test dry run mode."""
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value={"id": "test", "title": "Test"})
-    mock_ydl_class.return_value = mock_ydl
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        stats = download_videos(
-            videos=mock_videos,
-            output_dir=tmpdir,
-            dry_run=True,
-            verbose=False,
-        )
-
+def _check_dry_run(stats, ydl_opts, output_dir):
     # Check that simulate option was set
-    call_args = mock_ydl_class.call_args[0][0]
-    assert call_args["simulate"] is True
+    assert ydl_opts["simulate"] is True
     assert stats["success"] == 2
 
 
-@patch("youtube_channel_downloader.downloader.yt_dlp.YoutubeDL")
-def test_download_videos_with_cookie(mock_ydl_class, mock_videos):
-    """Test downloads with cookie file."""
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value={"id": "test", "title": "Test"})
-    mock_ydl_class.return_value = mock_ydl
-
-    cookie_path = Path("/fake/cookies.txt")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        download_videos(
-            videos=mock_videos,
-            output_dir=tmpdir,
-            cookie_file=cookie_path,
-            dry_run=False,
-            verbose=False,
+def _check_cookie(stats, ydl_opts, output_dir):
+    # Verify cookie file was passed
+    assert ydl_opts["cookiefile"] == str(Path("/fake/cookies.txt"))
+
+
+def _check_output_directory(stats, ydl_opts, output_dir):
+    assert output_dir.exists()
+    assert output_dir.is_dir()
+
+
+@pytest.mark.parametrize(
+    "kwargs,output_subdir,check",
+    [
+        pytest.param({}, "", _check_success, id="success"),
+        pytest.param({"dry_run": True}, "", _check_dry_run, id="dry_run"),
+        pytest.param(
+            {"cookie_file": Path("/fake/cookies.txt")}, "", _check_cookie, id="with_cookie"
+        ),
+        pytest.param({}, "new_folder/videos", _check_output_directory, id="creates_output_dir"),
+    ],
+)
+def test_download_videos(mock_ydl_class, tmp_path, kwargs, output_subdir, check):
+    """Test downloads with various options."""
+    output_dir = tmp_path / output_subdir
+
+    stats = download_videos(videos=MOCK_VIDEOS, output_dir=str(output_dir), **kwargs)
+
+    check(stats, mock_ydl_class.call_args[0][0], output_dir)
+    # A single YoutubeDL instance is reused for every video
+    assert mock_ydl_class.call_count == 1
+
+
+def test_download_videos_concurrent(mock_ydl_class, ydl_mock, tmp_path):
+    """Test parallel downloads with multiple workers."""
+    # Each call waits for the other, so this only passes if both downloads overlap
+    barrier = threading.Barrier(2, timeout=5)
+
+    def extract_info(url, download):
+        barrier.wait()
+        return {"id": url[-6:]}
+
+    ydl_mock.extract_info = Mock(side_effect=extract_info)
+
+    stats = download_videos(
+        videos=MOCK_VIDEOS,
+        output_dir=str(tmp_path),
+        max_concurrent=2,
+        verbose=False,
+    )
+
+    rows = (tmp_path / "videos_metadata.csv").read_text().splitlines()
+
+    assert stats["success"] == 2
+    assert ydl_mock.extract_info.call_count == 2
+    assert sorted(row.split(",")[0] for row in rows[1:]) == ["video1", "video2"]
+
+
+@pytest.mark.parametrize("skip_existing", [True, False])
+def test_download_videos_duplicate_ids(mock_ydl_class, ydl_mock, tmp_path, capsys, skip_existing):
+    """Test that a video listed twice is downloaded and recorded once, even in parallel."""
+    # Both workers must be busy at once, so a second copy of video1 would overlap the first
+    barrier = threading.Barrier(2, timeout=5)
+
+    def extract_info(url, download):
+        barrier.wait()
+        return {"id": url[-6:]}
+
+    ydl_mock.extract_info = Mock(side_effect=extract_info)
+    videos = [MOCK_VIDEOS[0], MOCK_VIDEOS[0], MOCK_VIDEOS[1]]
+
+    stats = download_videos(
+        videos=videos,
+        output_dir=str(tmp_path),
+        max_concurrent=2,
+        verbose=False,
+        skip_existing=skip_existing,
+    )
+
+    rows = (tmp_path / "videos_metadata.csv").read_text().splitlines()
+    ids = (tmp_path / "videos_metadata.ids").read_text().splitlines()
+
+    assert stats["success"] == 2
+    assert stats["skipped"] == 1
+    assert stats["failed"] == 0
+    assert ydl_mock.extract_info.call_count == 2
+    assert sorted(row.split(",")[0] for row in rows[1:]) == ["video1", "video2"]
+    assert sorted(ids) == ["video1", "video2"]
+    output = capsys.readouterr().out
+    assert "Duplicate entry" in output
+    assert "Already downloaded" not in output
+
+
+def test_download_videos_progress_hook(mock_ydl_class, ydl_mock, tmp_path, monkeypatch):
+    """Test that the shared progress hook updates each concurrent video's own bar."""
+    bars = {}
+    updates = []
+    add_task = Progress.add_task
+
+    def record_add_task(self, description, **kwargs):
+        bars[description] = add_task(self, description, **kwargs)
+        return bars[description]
+
+    monkeypatch.setattr(Progress, "add_task", record_add_task)
+    monkeypatch.setattr(
+        Progress, "update", lambda self, task_id, completed: updates.append((task_id, completed))
+    )
+    barrier = threading.Barrier(2, timeout=5)
+
+    def extract_info(url, download):
+        video_id = url[-6:]
+        hook = mock_ydl_class.call_args[0][0]["progress_hooks"][0]
+        # Both bars exist before either video reports progress
+        barrier.wait()
+        size = {"total_bytes": 200} if video_id == "video1" else {"total_bytes_estimate": 400}
+        hook(
+            {
+                "status": "downloading",
+                "info_dict": {"id": video_id},
+                "downloaded_bytes": 100,
+                **size,
+            }
         )
+        hook({"status": "finished", "info_dict": {"id": video_id}})
+        # Progress for videos without a bar is ignored
+        hook({"status": "finished", "info_dict": {"id": "unknown"}})
+        return {"id": video_id}
 
-    # Verify cookie file was passed
-    call_args = mock_ydl_class.call_args[0][0]
-    assert "cookiefile" in call_args
-    assert call_args["cookiefile"] == str(cookie_path)
+    ydl_mock.extract_info = Mock(side_effect=extract_info)
+
+    download_videos(videos=MOCK_VIDEOS, output_dir=str(tmp_path), max_concurrent=2, verbose=False)
+
+    video1, video2 = bars["Test Video 1"], bars["Test Video 2"]
+    assert video1 != video2
+    assert sorted(updates) == sorted([(video1, 50.0), (video1, 100), (video2, 25.0), (video2, 100)])
+
+
+def test_download_videos_uses_entry_url(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that listing URLs are used and entries without an ID fail."""
+    ydl_mock.extract_info = Mock(return_value={"id": "short1", "title": "Short"})
+
+    videos = [
+        {
+            "_type": "url",
+            "id": "short1",
+            "title": "Short",
+            "url": "https://www.youtube.com/shorts/short1",
+        },
+        {"title": "No ID"},
+    ]
+
+    stats = download_videos(videos=videos, output_dir=str(tmp_path), verbose=False)
+
+    ydl_mock.extract_info.assert_called_once_with(
+        "https://www.youtube.com/shorts/short1", download=True
+    )
+    assert stats["success"] == 1
+    assert stats["failed"] == 1
+    assert stats["failed_videos"][0]["title"] == "No ID"
+
+
+def test_download_videos_processed_video_url(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that a fully processed video is fetched by its page URL, not its media URL."""
+    videos = [
+        {
+            "id": "live01",
+            "title": "Live",
+            "url": "https://rr1---sn-abc.googlevideo.com/videoplayback?id=live01",
+            "webpage_url": "https://www.youtube.com/watch?v=live01",
+        },
+        {"id": "video2", "title": "No page URL", "url": "https://example.com/index.m3u8"},
+    ]
 
+    download_videos(videos=videos, output_dir=str(tmp_path), verbose=False)
 
-@patch("youtube_channel_downloader.downloader.yt_dlp.YoutubeDL")
-def test_download_videos_partial_failure(mock_ydl_class, mock_videos):
-    """Test when some downloads fail."""
-    import yt_dlp.utils
+    assert [c.args[0] for c in ydl_mock.extract_info.call_args_list] == [
+        "https://www.youtube.com/watch?v=live01",
+        "https://www.youtube.com/watch?v=video2",
+    ]
 
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
 
+def test_download_videos_partial_failure(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that a failed download stops the videos queued after it."""
+    videos = MOCK_VIDEOS + [{"id": "video3", "title": "Test Video 3"}]
     # First video succeeds, second fails
-    mock_ydl.extract_info = Mock(
+    ydl_mock.extract_info = Mock(
         side_effect=[
             {"id": "video1", "title": "Test Video 1"},
             yt_dlp.utils.DownloadError("Video unavailable"),
         ]
     )
-    mock_ydl_class.return_value = mock_ydl
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        stats = download_videos(
-            videos=mock_videos,
-            output_dir=tmpdir,
-            dry_run=False,
-            verbose=False,
-        )
 
-    assert stats["total"] == 2
+    stats = download_videos(
+        videos=videos,
+        output_dir=str(tmp_path),
+        dry_run=False,
+        verbose=False,
+    )
+
+    assert stats["total"] == 3
     assert stats["success"] == 1
     assert stats["failed"] == 1
     assert len(stats["failed_videos"]) == 1
     assert stats["failed_videos"][0]["id"] == "video2"
+    # The third video is never started
+    assert ydl_mock.extract_info.call_count == 2
 
 
-@patch("youtube_channel_downloader.downloader.yt_dlp.YoutubeDL")
-def test_download_creates_output_directory(mock_ydl_class, mock_videos):
-    """Test that output directory is created if it doesn't exist."""
-    mock_ydl = MagicMock()
-    mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-    mock_ydl.__exit__ = Mock(return_value=False)
-    mock_ydl.extract_info = Mock(return_value={"id": "test", "title": "Test"})
-    mock_ydl_class.return_value = mock_ydl
+def test_download_videos_interrupted(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that Ctrl-C stops the run and keeps the rows already written."""
+    videos = MOCK_VIDEOS + [{"id": "video3", "title": "Test Video 3"}]
+    ydl_mock.extract_info = Mock(
+        side_effect=[{"id": "video1", "title": "Test Video 1"}, KeyboardInterrupt()]
+    )
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        output_dir = Path(tmpdir) / "new_folder" / "videos"
+    with pytest.raises(KeyboardInterrupt):
+        download_videos(videos=videos, output_dir=str(tmp_path), verbose=False)
 
-        download_videos(
-            videos=mock_videos,
-            output_dir=str(output_dir),
-            dry_run=False,
-            verbose=False,
-        )
+    assert ydl_mock.extract_info.call_count == 2
+    assert (tmp_path / "videos_metadata.ids").read_text().splitlines() == ["video1"]
 
-        assert output_dir.exists()
-        assert output_dir.is_dir()
 
+def test_download_videos_interrupted_concurrent(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that Ctrl-C doesn't wait for in-flight parallel downloads."""
+    started = threading.Event()
+    release = threading.Event()
+    finished = threading.Event()
+
+    def extract_info(url, download):
+        if url.endswith("video1"):
+            started.set()
+            release.wait(timeout=5)
+            finished.set()
+            return {"id": "video1"}
+        started.wait(timeout=5)
+        raise KeyboardInterrupt()
+
+    ydl_mock.extract_info = Mock(side_effect=extract_info)
+
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            download_videos(
+                videos=MOCK_VIDEOS, output_dir=str(tmp_path), max_concurrent=2, verbose=False
+            )
+        # video1 is still downloading when the interrupt surfaces
+        assert not finished.is_set()
+    finally:
+        release.set()
+
+
+def test_download_videos_resumes_from_csv(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that IDs from an existing CSV seed the sidecar and are skipped."""
+    ydl_mock.extract_info = Mock(return_value={"id": "video2", "title": "Test Video 2"})
+
+    (tmp_path / "videos_metadata.csv").write_text("video_id,title\nvideo1,Test Video 1\n")
+
+    stats = download_videos(
+        videos=MOCK_VIDEOS,
+        output_dir=str(tmp_path),
+        dry_run=False,
+        verbose=False,
+    )
+
+    ids = (tmp_path / "videos_metadata.ids").read_text().splitlines()
+
+    assert stats["skipped"] == 1
+    assert stats["success"] == 1
+    assert ids == ["video1", "video2"]
 
-@patch("youtube_channel_downloader.downloader.console")
-def test_display_download_summary(mock_console):
+
+def test_download_videos_skips_existing_files(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that videos with an existing .mp4 file are skipped."""
+    ydl_mock.extract_info = Mock(return_value={"id": "video2", "title": "Test Video 2"})
+
+    (tmp_path / "video1.mp4").touch()
+
+    stats = download_videos(
+        videos=MOCK_VIDEOS,
+        output_dir=str(tmp_path),
+        dry_run=False,
+        verbose=False,
+    )
+
+    assert stats["skipped"] == 1
+    assert stats["success"] == 1
+    ydl_mock.extract_info.assert_called_once()
+
+
+def test_download_videos_flushes_in_batches(mock_ydl_class, ydl_mock, tmp_path):
+    """Test that each full batch of rows reaches disk, CSV and sidecar together."""
+    videos = [{"id": f"vid{i:03d}", "title": f"Video {i}"} for i in range(CSV_FLUSH_EVERY + 2)]
+    on_disk = []
+
+    def extract_info(url, download):
+        video_id = url[-6:]
+        if video_id == videos[CSV_FLUSH_EVERY]["id"]:
+            # The first batch was flushed before this download started
+            csv_rows = (tmp_path / "videos_metadata.csv").read_text().splitlines()
+            ids = (tmp_path / "videos_metadata.ids").read_text().splitlines()
+            on_disk.append((len(csv_rows) - 1, ids))
+        return {"id": video_id}
+
+    ydl_mock.extract_info = Mock(side_effect=extract_info)
+
+    download_videos(videos=videos, output_dir=str(tmp_path), verbose=False)
+
+    first_batch = [v["id"] for v in videos[:CSV_FLUSH_EVERY]]
+    assert on_disk == [(CSV_FLUSH_EVERY, first_batch)]
+    # Closing writes the partial batch
+    ids = (tmp_path / "videos_metadata.ids").read_text().splitlines()
+    assert ids == [v["id"] for v in videos]
+
+
+def test_csv_row_matches_csv_module():
+    """Test that hand-formatted CSV rows match what the csv module writes."""
+    values = ["plain", 'with "quotes"', "a, b", "multi\nline", "", None, 42, 29.97]
+
+    expected = io.StringIO()
+    csv.writer(expected).writerow(values)
+
+    assert _csv_row(values) == expected.getvalue()
+
+
+def test_display_download_summary(monkeypatch):
     """Test download summary display."""
+    mock_console = Mock()
+    monkeypatch.setattr(downloader, "console", mock_console)
+
     stats = {
         "total": 10,
         "success": 8,
@@ -172,15 +391,14 @@ def test_display_download_summary(mock_console):
     assert "2" in summary_text  # failed count
 
 
-def test_download_videos_empty_list():
+def test_download_videos_empty_list(tmp_path):
     """Test downloading empty video list."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        stats = download_videos(
-            videos=[],
-            output_dir=tmpdir,
-            dry_run=False,
-            verbose=False,
-        )
+    stats = download_videos(
+        videos=[],
+        output_dir=str(tmp_path),
+        dry_run=False,
+        verbose=False,
+    )
 
     assert stats["total"] == 0
     assert stats["success"] == 0